@@ -5,66 +5,152 @@ Advanced Anime Watchlist Tracker
 A feature-rich terminal application for managing your anime collection
 """
 
+import argparse
+import atexit
+import functools
+import itertools
 import json
+import mmap
+import operator
 import os
 import sys
 import hashlib
+import heapq
+import hmac
 import getpass
+import secrets
+import time
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC #password based key verifiaction function 2
 
-# First try to import rich normally
+# orjson is optional, the stdlib json module is used when it's missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# keyring is optional (and imported where it's used), without it the key is
+# derived from the password on every launch
+KEYRING_SERVICE = "AnimTrack"
+
+# Seconds adult content stays unlocked after the adult password was entered
+ADULT_UNLOCK_SECONDS = 300
+
+# Smaller files are cheaper to read than to map
+MMAP_MIN_SIZE = 1 << 20
+
+# Buffer size for export and backup files, whose JSON may be written in many small pieces
+WRITE_BUFFER_SIZE = 1 << 20
+
+# PBKDF2 cost for the key that wraps the data key; configs without
+# "kdf_iterations" were written before key wrapping
+KDF_ITERATIONS = 600000
+LEGACY_KDF_ITERATIONS = 100000
+
+# One SHA-256 output block, so PBKDF2 runs a single block and there is
+# nothing to split across threads
+KDF_KEY_LENGTH = 32
+
+# data.enc layout: 12-byte AES-GCM nonce followed by the ciphertext
+NONCE_SIZE = 12
+
+# cryptography and rich's Table (which drags in decimal and fractions) are
+# imported where they're used, so paths like --help don't load them
+MISSING_PACKAGES_HINT = "Please run: pip install rich cryptography"
+
 try:
     from rich.console import Console
-    from rich.table import Table
     from rich.panel import Panel
     from rich.prompt import Prompt, Confirm
-    from rich.progress import Progress, SpinnerColumn, TextColumn
     from rich.text import Text
-    from rich import box
-    from rich.align import Align
-    RICH_AVAILABLE = True
+    from rich.style import Style
 except ImportError:
-    RICH_AVAILABLE = False
-
-# If rich is not available, try to install it
-if not RICH_AVAILABLE:
-    print("Installing required packages...")
-    os.system("pip install rich cryptography")
-    # Try importing again after installation
-    try:
-        from rich.console import Console
-        from rich.table import Table
-        from rich.panel import Panel
-        from rich.prompt import Prompt, Confirm
-        from rich.progress import Progress, SpinnerColumn, TextColumn
-        from rich.text import Text
-        from rich import box
-        from rich.align import Align
-        RICH_AVAILABLE = True
-    except ImportError:
-        print("Failed to install required packages. Please run: pip install rich cryptography")
-        sys.exit(1)
+    print(f"Missing required packages. {MISSING_PACKAGES_HINT}")
+    sys.exit(1)
 
 # Now we can safely create the console instance
 console = Console()
 
+#color coding for status
+STATUS_COLORS = {
+    "Watching": "green",
+    "Completed": "blue",
+    "On Hold": "yellow",
+    "Dropped": "red",
+    "Plan to Watch": "white"
+}
+STATUS_MARKUP = {status: f"[{color}]{status}[/{color}]" for status, color in STATUS_COLORS.items()}
+
+# Styled cells for display_all_anime, built once; Text cells aren't run through the markup parser
+STATUS_TEXT = {status: Text(status, style=Style(color=color)) for status, color in STATUS_COLORS.items()}
+# Progress styles indexed by not started / in progress / finished
+PROGRESS_STYLES = (Style(), Style(color="yellow"), Style(color="green"))
+
+# Progress markup indexed by started + finished (not started keeps the column style)
+PROGRESS_FORMATS = ("{}/{}", "[yellow]{}/{}[/yellow]", "[green]{}/{}[/green]")
+
+def last_watched_key(anime):
+    """Sort key for the watchlist view"""
+    return anime.get("last_watched", "")
+
+def encode_default(obj):
+    """Serialize the types orjson handles natively when falling back to json"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(obj) -> bytes:
+    """Serialize data to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=encode_default).encode()
+
+def write_json(f, obj):
+    """Write indented JSON to a binary file; without orjson it's streamed so the whole text is never held at once"""
+    if orjson is not None:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=encode_default)
+    for chunk in encoder.iterencode(obj):
+        f.write(chunk.encode())
+
+def decode_json(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+@functools.lru_cache(maxsize=1024)
+def split_genres(genre) -> tuple:
+    """Split a comma separated genre string (most titles share a handful of these)"""
+    return tuple(g.strip() for g in genre.split(","))
+
+def read_json_file(path):
+    """Parse a JSON file, memory-mapping it when it's large"""
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return decode_json(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
 class AnimeTracker:
-    def __init__(self):
+    def __init__(self, reauth=False):
         #create data directory in user's home folder
         self.app_dir = os.path.join(os.path.expanduser("~"), ".Anime")
         self.ensure_data_directory()
 
         self.data_file = os.path.join(self.app_dir, "data.enc")
         self.config_file = os.path.join(self.app_dir, "config.json")
-        self.exports_dir = os.path.join(self.app_dir, "exports")
 
         self.adult_password_hash = None
+        self.adult_unlocked_until = 0.0
         self.encryption_key = None
+        self.verified_data = None
+        self.config = {}
+        self.dirty = False
+        self.reauth = reauth
         self.data = {
             "anime_list": [],
             "adult_content": [],
@@ -75,8 +161,43 @@ class AnimeTracker:
                 "completion_role": 0
             }
         }
+        self.genre_counter = Counter()
+        self.display_order_cache = {}
+        self.data_file_size = None
+        self.backup_month_dir = None
+        self.help_panel = None
+        self.info_rows = None
+        self.recompute_stats()
+        self.index_anime()
         self.load_config()
         self.initialize_encryption()
+        atexit.register(self.flush)
+
+        #menu commands, the adult ones are only run after the adult password check
+        commands = {
+            "add": self.add_anime,
+            "list": self.display_anime_list,
+            "update": self.update_anime,
+            "delete": self.delete_anime,
+            "search": self.search_anime,
+            "stats": self.show_stats,
+            "export": self.export_data,
+            "import": self.import_data,
+            "backup": self.create_backup,
+            "info": self.show_app_info,
+            "help": self.show_help,
+            "list-all": functools.partial(self.display_all_anime, adult_mode=True)
+        }
+        adult_commands = {
+            "adult": self.enter_adult_mode,
+            "adult-add": functools.partial(self.add_anime, adult_mode=True),
+            "adult-list": functools.partial(self.display_anime_list, adult_mode=True),
+            "adult-update": functools.partial(self.update_anime, adult_mode=True),
+            "adult-delete": functools.partial(self.delete_anime, adult_mode=True),
+            "adult-search": functools.partial(self.search_anime, adult_mode=True)
+        }
+        self.commands = {sys.intern(name): handler for name, handler in commands.items()}
+        self.adult_commands = {sys.intern(name): handler for name, handler in adult_commands.items()}
 
     def ensure_data_directory(self):
         """Create application data directory if it doesn't exists"""
@@ -85,33 +206,55 @@ class AnimeTracker:
                 os.makedirs(self.app_dir)
                 console.print(f"[green]✓ Created data directory: {self.app_dir}[/green]")
 
-            #create exports subdirectory
-            exports_path = os.path.join(self.app_dir, "exports")
-            if not os.path.exists(exports_path):
-                os.makedirs(exports_path)
-        
         except Exception as e:
             console.print(f"[red]Error creating data directory: {e}[/red]")
             console.print(f"[yellow]Falling back to current directory[/yellow]")
             self.app_dir = "."
 
-    def generate_key_from_password(self, password, salt) -> bytes:
+        #create exports and backups subdirectories once, so exports and backups can write straight away
+        self.exports_dir = os.path.join(self.app_dir, "exports")
+        self.backups_dir = os.path.join(self.app_dir, "backups")
+        for path in (self.exports_dir, self.backups_dir):
+            try:
+                os.makedirs(path, exist_ok=True)
+            except OSError as e:
+                console.print(f"[red]Error creating {path}: {e}[/red]")
+
+    def generate_key_from_password(self, password, salt, iterations=KDF_ITERATIONS) -> bytes:
         """Generate encryptuon key from the password"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        # hashlib runs the whole PBKDF2 loop inside OpenSSL
+        derived = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=KDF_KEY_LENGTH)
+        key = base64.urlsafe_b64encode(derived)
         return key
-    
+
+    def wrap_data_key(self, password, config):
+        """Encrypt the data key with a key derived from the password and store it in config"""
+        from cryptography.fernet import Fernet
+        salt = base64.b64decode(config["salt"])
+        kek = self.generate_key_from_password(password, salt)
+        config["kdf_iterations"] = KDF_ITERATIONS
+        data_key = base64.urlsafe_b64encode(self.encryption_key)
+        config["wrapped_dek"] = Fernet(kek).encrypt(data_key).decode()
+
+    def unwrap_data_key(self, password, config) -> bytes:
+        """Derive the key from the password and use it to decrypt the data key"""
+        from cryptography.fernet import Fernet
+        salt = base64.b64decode(config["salt"])
+        iterations = config.get("kdf_iterations", LEGACY_KDF_ITERATIONS)
+        kek = self.generate_key_from_password(password, salt, iterations)
+        if "wrapped_dek" not in config:
+            # older configs encrypt the data with the derived key directly
+            return base64.urlsafe_b64decode(kek)
+        return base64.urlsafe_b64decode(Fernet(kek).decrypt(config["wrapped_dek"].encode()))
+
     def initialize_encryption(self):
         """Initialize encryption systems"""
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
         if not os.path.exists(self.config_file):
             password = getpass.getpass("Set master password for encryption: ")
             salt = os.urandom(16)
-            self.encryption_key = self.generate_key_from_password(password, salt)
+            self.encryption_key = AESGCM.generate_key(bit_length=256)
 
             #Save the salt for furture use
             recovery_key = Fernet.generate_key().decode()
@@ -124,48 +267,109 @@ class AnimeTracker:
             if Confirm.ask("\nWould you like to set up security questions for additional recovery options?"):
                 self.setup_security_question()
 
-            config = {
+            self.config = {
                 "salt": base64.b64encode(salt).decode(),
                 "recovery_key_hash": self.hash_password(recovery_key),
                 "adult_password_hash": None,
-                "security_questions": getattr(self, 'security_questions', None)
+                "security_questions": getattr(self, 'security_questions', None),
+                "install_id": secrets.token_hex(16),
+                "recovery_wrapped_dek": Fernet(recovery_key.encode()).encrypt(base64.urlsafe_b64encode(self.encryption_key)).decode()
             }
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f)
+            self.wrap_data_key(password, self.config)
+            self.save_config()
+            self.cache_encryption_key()
         else:
             self.load_encryption()
-    
+
+    def cache_encryption_key(self):
+        """Remember the derived key in the OS keyring so the next launch skips PBKDF2"""
+        try:
+            import keyring
+        except ImportError:
+            return
+        if not self.config.get("install_id"):
+            self.config["install_id"] = secrets.token_hex(16)
+            self.save_config()
+        try:
+            keyring.set_password(KEYRING_SERVICE, self.config["install_id"], base64.urlsafe_b64encode(self.encryption_key).decode())
+        except Exception:
+            pass  # no usable keyring backend, fall back to the password prompt
+
+    def load_cached_encryption_key(self):
+        """Return the key stored by cache_encryption_key, or None on a miss"""
+        if not self.config.get("install_id"):
+            return None
+        try:
+            import keyring
+        except ImportError:
+            return None
+        try:
+            cached = keyring.get_password(KEYRING_SERVICE, self.config["install_id"])
+            return base64.urlsafe_b64decode(cached) if cached else None
+        except Exception:
+            return None  # no usable backend or a damaged entry, ask for the password instead
+
+    def check_encryption_key(self):
+        """Check the current key against the data file (if there is one)"""
+        if not os.path.exists(self.data_file):
+            return True
+        try:
+            with open(self.data_file, 'rb') as f:
+                encrypted_data = f.read()
+            # Keep the plaintext so load_data doesn't read and decrypt the file a second time
+            self.verified_data = self.decrypt_data(encrypted_data)
+            self.data_file_size = len(encrypted_data)
+            return True
+        except Exception:
+            return False
+
     def load_encryption(self):
-        with open(self.config_file, 'r') as f:
-            config = json.load(f)
-        
+        config = self.config
+
+        if not self.reauth:
+            self.encryption_key = self.load_cached_encryption_key()
+            if self.encryption_key and self.check_encryption_key():
+                return
+
         try:
             password = getpass.getpass("Enter master password (or press enter for recovery options):")
             if password:
-                salt = base64.b64decode(config["salt"])
-                self.encryption_key = self.generate_key_from_password(password, salt)
-                if os.path.exists(self.data_file):
-                    with open(self.data_file,'rb') as f:
-                        encrypted_data = f.read()
-                    self.decrypt_data(encrypted_data)
-                return
+                self.encryption_key = self.unwrap_data_key(password, config)
+                if self.check_encryption_key():
+                    # Rewrap with the current iteration count if the config is older
+                    if config.get("kdf_iterations", LEGACY_KDF_ITERATIONS) < KDF_ITERATIONS:
+                        self.wrap_data_key(password, config)
+                        self.save_config()
+                    self.cache_encryption_key()
+                    return
         except:
             pass
+        self.encryption_key = None
         console.print("\n[bold red]Password incorrect or forgotten[/bold red]")
+        # Only a recovery key with a wrapped copy of the data key can unlock data that already exists
+        has_data = os.path.exists(self.data_file)
         if config.get("recovery_key_hash"):
-            if Confirm.ask("Would you like to use your recovery key?"):
+            if has_data and not config.get("recovery_wrapped_dek"):
+                console.print("[yellow]Your recovery key is from before the upgrade and can't unlock your existing data.[/yellow]")
+            elif Confirm.ask("Would you like to use your recovery key?"):
                 recovery_key = Prompt.ask("Enter your recovery key")
-                if self.hash_password(recovery_key) == config["recovery_key_hash"]:
+                if self.check_password(recovery_key, config["recovery_key_hash"]):
                     console.print("[green]✓ Recovery key accepted![/green]")
+                    if config.get("recovery_wrapped_dek"):
+                        from cryptography.fernet import Fernet
+                        data_key = Fernet(recovery_key.encode()).decrypt(config["recovery_wrapped_dek"].encode())
+                        self.encryption_key = base64.urlsafe_b64decode(data_key)
                     # Generate new password
-                    self.reset_password()
-                    return
+                    if self.reset_password():
+                        return
                 
         if config.get("security_questions"):
-            if Confirm.ask("Would you like to answer security questions to reset your password?"):
+            if has_data:
+                console.print("[yellow]Security questions can't unlock your existing data, only the master password or recovery key can.[/yellow]")
+            elif Confirm.ask("Would you like to answer security questions to reset your password?"):
                 if self.verify_security_questions(config["security_questions"]):
-                    self.reset_password()
-                    return
+                    if self.reset_password():
+                        return
     
         console.print("[red]No valid recovery method available. Access denied.[/red]")
         sys.exit(1)
@@ -191,15 +395,13 @@ class AnimeTracker:
         console.print("\n[bold]Answer your security questions[/bold]")
         for i, question_data in enumerate(stored_questions):
             answer = Prompt.ask(f"Question {i+1}: {question_data['question']}").lower().strip()
-            if self.hash_password(answer) != question_data["answer_hash"]:
+            if not self.check_password(answer, question_data["answer_hash"]):
                 console.print("[red]Incorrect answer![/red]")
                 return False
         return True
 
     def reset_password(self):
-        config = {}
-        with open(self.config_file, 'r') as f:
-            config = json.load(f)
+        config = self.config
     
         console.print("\n[bold]Setting new master password[/bold]")
         new_password = getpass.getpass("Enter new master password: ")
@@ -209,16 +411,20 @@ class AnimeTracker:
             console.print("[red]Passwords don't match![/red]")
             return False
     
-        salt = base64.b64decode(config["salt"])
-        self.encryption_key = self.generate_key_from_password(new_password, salt)
-    
-        # Re-encrypt data with new password if it exists
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'rb') as f:
-                encrypted_data = f.read()
-            decrypted_data = self.decrypt_data(encrypted_data)
-            self.save_data()  # Will encrypt with new key
-    
+        if self.encryption_key is None:
+            if os.path.exists(self.data_file):
+                console.print("[red]Your data can only be unlocked with the master password or recovery key.[/red]")
+                return False
+            # Nothing is encrypted yet, so start over with a fresh data key
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            self.encryption_key = AESGCM.generate_key(bit_length=256)
+            config.pop("recovery_wrapped_dek", None)
+
+        # Only the wrapped data key changes, data.enc stays as it is
+        self.wrap_data_key(new_password, config)
+        self.save_config()
+
+        self.cache_encryption_key()
         console.print("[green]✓ Password changed successfully![/green]")
         return True
 
@@ -227,10 +433,12 @@ class AnimeTracker:
         if os.path.exists(self.config_file):
             try:
                with open(self.config_file, 'r') as f:
-                   config = json.load(f)
-                   self.adult_password_hash = config.get("adult_password_hash")
-                   if not hasattr(self, 'security_questions'):
-                       self.security_questions = config.get('security_questions', [])
+                   self.config = json.load(f)
+               self.adult_password_hash = self.config.get("adult_password_hash")
+               if not hasattr(self, 'security_questions'):
+                   self.security_questions = self.config.get('security_questions', [])
+               if "adult_security_questions" in self.config:
+                   self.adult_security_questions = self.config["adult_security_questions"]
             except Exception as e:
                 console.print(f"[red]Error loading config: {e}[/red]")
                 self.adult_password_hash = None
@@ -238,42 +446,110 @@ class AnimeTracker:
                
     def save_config(self):
         """save config file data"""
-        with open(self.config_file, 'r') as f:
-            config = json.load(f)
-        config["adult_password_hash"] = self.adult_password_hash
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f)
+        # self.config is kept in sync with the file, so there's nothing to read back first
+        self.config["adult_password_hash"] = self.adult_password_hash
+        # The config holds the only copies of the wrapped data key, so never leave it half written
+        tmp_file = self.config_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.config, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.config_file)
 
     def encrypt_data(self, data) -> bytes:
-        f = Fernet(self.encryption_key)
-        return f.encrypt(data.encode())
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + AESGCM(self.encryption_key).encrypt(nonce, data, None)
     
-    def decrypt_data(self, encrypted_data) -> str:
-        f = Fernet(self.encryption_key)
-        return f.decrypt(encrypted_data).decode()
+    def decrypt_data(self, encrypted_data) -> bytes:
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        nonce, ciphertext = encrypted_data[:NONCE_SIZE], encrypted_data[NONCE_SIZE:]
+        try:
+            return AESGCM(self.encryption_key).decrypt(nonce, ciphertext, None)
+        except InvalidTag:
+            # data.enc written by older versions is a Fernet token
+            from cryptography.fernet import Fernet
+            f = Fernet(base64.urlsafe_b64encode(self.encryption_key))
+            return f.decrypt(encrypted_data)
     
     def save_data(self):
         try:
-            json_data = json.dumps(self.data, indent=2)
+            # Nobody reads the plaintext, so skip the indentation
+            json_data = encode_json(self.data)
             encrypted_data = self.encrypt_data(json_data)
-            with open(self.data_file, 'wb') as f:
+            # Write next to the data file and swap it in so a crash can't leave it half written
+            tmp_file = self.data_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
                 f.write(encrypted_data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            self.data_file_size = len(encrypted_data)
+            self.dirty = False
         except Exception as e:
             console.print(f"[red]Error saving data: {e}[/red]")
+
+    def mark_dirty(self):
+        """Record a change and save it straight away"""
+        self.dirty = True
+        self.save_data()
+
+    def flush(self):
+        """Retry a save that failed earlier (also runs at exit)"""
+        if self.dirty:
+            self.save_data()
             
     def load_data(self):
-        if os.path.exists(self.data_file):
+        decrypted_data, self.verified_data = self.verified_data, None
+        if decrypted_data is not None or os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'rb') as f:
-                    encrypted_data = f.read()
-                decrypted_data = self.decrypt_data(encrypted_data)
-                self.data = json.loads(decrypted_data)
+                if decrypted_data is None:
+                    with open(self.data_file, 'rb') as f:
+                        encrypted_data = f.read()
+                    self.data_file_size = len(encrypted_data)
+                    decrypted_data = self.decrypt_data(encrypted_data)
+                self.data = decode_json(decrypted_data)
             except Exception as e:
                 console.print(f"[red]Error loading data (wrong password?): {e}[/red]")
                 sys.exit(1)
+        self.list_changed()
+        self.recompute_stats()
+        self.index_anime()
+
+    def index_anime(self):
+        """Rebuild the id lookup table and the next free id"""
+        self.anime_by_id = {}
+        duplicates = []
+        for adult_mode, key in ((False, "anime_list"), (True, "adult_content")):
+            for anime in self.data[key]:
+                anime.setdefault("adult_content", adult_mode)
+                if anime["id"] in self.anime_by_id:
+                    duplicates.append(anime)
+                else:
+                    self.anime_by_id[anime["id"]] = anime
+        self.next_id = max(self.anime_by_id, default=0) + 1
+
+        # Older versions could hand out the same id twice after a delete
+        for anime in duplicates:
+            anime["id"] = self.next_id
+            self.anime_by_id[anime["id"]] = anime
+            self.next_id += 1
+
+        # Both lists are kept in id order; new ids only ever go at the end
+        for key in ("anime_list", "adult_content"):
+            self.data[key].sort(key=operator.itemgetter("id"))
+
+    @staticmethod
+    def hash_bytes(data) -> str:
+        return hashlib.sha256(data).hexdigest()
 
     def hash_password(self, password) -> str:
-        return hashlib.sha256(password.encode()).hexdigest()
+        return self.hash_bytes(password.encode())
+
+    def check_password(self, password, stored_hash) -> bool:
+        """Compare a password against a stored hash in constant time"""
+        return hmac.compare_digest(self.hash_password(password), stored_hash)
     
     def setup_adult_password(self):
         """Improved adult password setup with confirmation and masking"""
@@ -302,6 +578,15 @@ class AnimeTracker:
                     console.print("[red]Passwords don't match! Try again[/red]")
         return False
 
+    def unlock_adult_content(self) -> bool:
+        """Ask for the adult password unless it was entered in the last few minutes"""
+        if time.monotonic() < self.adult_unlocked_until:
+            return True
+        if not self.verify_adult_password():
+            return False
+        self.adult_unlocked_until = time.monotonic() + ADULT_UNLOCK_SECONDS
+        return True
+
     def verify_adult_password(self) -> bool:
         """Improved verification with attempts limit"""
         if self.adult_password_hash is None:
@@ -310,7 +595,7 @@ class AnimeTracker:
         attempts = 3
         while attempts > 0:
             password = getpass.getpass("Enter adult content password: ")
-            if self.hash_password(password) == self.adult_password_hash:
+            if self.check_password(password, self.adult_password_hash):
                 return True
             
             attempts -= 1
@@ -345,11 +630,8 @@ class AnimeTracker:
             })
     
         # Save to config
-        with open(self.config_file, 'r') as f:
-            config = json.load(f)
-        config["adult_security_questions"] = self.adult_security_questions
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f)
+        self.config["adult_security_questions"] = self.adult_security_questions
+        self.save_config()
 
     def verify_adult_security_questions(self) -> bool:
         """Verify adult content security questions"""
@@ -360,7 +642,7 @@ class AnimeTracker:
         console.print("\n[bold]Adult Content Recovery[/bold]")
         for i, q in enumerate(self.adult_security_questions[:2]):
             answer = Prompt.ask(f"Q{i+1}: {q['question']}", password=True)
-            if self.hash_password(answer.lower().strip()) != q["answer_hash"]:
+            if not self.check_password(answer.lower().strip(), q["answer_hash"]):
                 console.print("[red]Verification failed![/red]")
                 return False
         return True
@@ -370,7 +652,7 @@ class AnimeTracker:
         console.print(Panel.fit("📝 Add New Anime", style="bold blue"))
 
         anime = {}
-        anime["id"] = len(self.data["anime_list"]) + len(self.data["adult_content"]) + 1
+        anime["id"] = self.next_id
         anime["title"] = Prompt.ask("Anime Title")
         anime["genre"] = Prompt.ask("Genre", default="Unknown")
         anime["status"] = Prompt.ask("Status", choices=["Watching", "Completed", "On Hold", "Dropped", "Plan to Watch"], default="Plan to Watch")
@@ -388,8 +670,9 @@ class AnimeTracker:
             return
         
         anime["notes"] = Prompt.ask("Notes", default="")
-        anime["date_added"] = datetime.now().strftime("%Y-%m-%d")
-        anime["last_watched"] = datetime.now().strftime("%Y-%m-%d") if anime["episodes_watched"] > 0 else ""
+        today = datetime.now().strftime("%Y-%m-%d")
+        anime["date_added"] = today
+        anime["last_watched"] = today if anime["episodes_watched"] > 0 else ""
 
         if adult_mode:
             anime["adult_content"] = True
@@ -397,47 +680,92 @@ class AnimeTracker:
         else:
             anime["adult_content"] = False
             self.data["anime_list"].append(anime)
+        self.anime_by_id[anime["id"]] = anime
+        self.next_id += 1
         
-        self.update_stats()
-        self.save_data()
+        self.list_changed(adult_mode)
+        self.track_stats(anime, adult_mode)
+        self.mark_dirty()
         console.print(f"[green]✓ Added '{anime['title']}' to your list![/green]")
 
     def update_stats(self, include_adult=False):
         """Update statistics, optionally including adult content"""
-        # Use only normal anime by default
-        anime_to_analyze = self.data["anime_list"].copy()
-    
-        # Include adult content if requested and password verified
-        if include_adult and self.verify_adult_password():
-            anime_to_analyze.extend(self.data["adult_content"])
-    
-        total_episodes = sum(anime["episodes_watched"] for anime in anime_to_analyze)
-        total_hours = total_episodes * 24 / 60  # Assuming 24 minutes per episode
+        # Include adult content only if requested and password verified
+        if include_adult and not self.unlock_adult_content():
+            include_adult = False
 
-        genre_count = {}
-        completed_count = 0
-    
-        for anime in anime_to_analyze:
-            # Count genres
-            genres = anime["genre"].split(", ")
-            for genre in genres:
-                genre_count[genre] = genre_count.get(genre, 0) + 1
+        # Mutations keep the running totals current, so only a change of scope needs a full pass
+        if self.data["stats"].get("includes_adult") != include_adult:
+            self.recompute_stats(include_adult)
+
+    def recompute_stats(self, include_adult=False):
+        """Rebuild the running statistics from the anime lists"""
+        # Use only normal anime by default; the lists are chained rather than copied
+        modes = (False, True) if include_adult else (False,)
+        sources = [self.data["adult_content"] if adult_mode else self.data["anime_list"] for adult_mode in modes]
 
-                # Count completed
-                if anime["status"] == "Completed":
-                    completed_count += 1
+        self.genre_counter = Counter()
+        self.genre_counter.update(itertools.chain.from_iterable(
+            split_genres(anime["genre"]) for anime in itertools.chain.from_iterable(sources)))
 
-        completion_rate = (completed_count / len(anime_to_analyze) * 100) if anime_to_analyze else 0
+        total_episodes = sum(anime["episodes_watched"] for anime in itertools.chain.from_iterable(sources))
+        completed_count = sum(1 for anime in itertools.chain.from_iterable(sources) if anime["status"] == "Completed")
 
         self.data["stats"] = {
             "total_episodes_watched": total_episodes,
-            "total_hours_watched": round(total_hours, 1),
-            "favorite_genres": genre_count,
-            "completion_rate": round(completion_rate, 1),
-            "total_anime": len(anime_to_analyze),
+            "total_anime": sum(len(anime_list) for anime_list in sources),
+            # Always counted, even when the other totals leave adult content out
+            "total_adult_content": len(self.data["adult_content"]),
             "completed_anime": completed_count,
+            # The Counter itself is stored; it serializes as a plain JSON object
+            "favorite_genres": self.genre_counter,
             "includes_adult": include_adult  # Track if stats include adult content
         }
+        self.finish_stats()
+
+    def track_stats(self, anime, adult_mode=False, sign=1):
+        """Add (sign=1) or remove (sign=-1) a single anime from the running statistics"""
+        stats = self.data["stats"]
+        if adult_mode:
+            stats["total_adult_content"] += sign
+            if not stats["includes_adult"]:
+                return
+
+        stats["total_episodes_watched"] += sign * anime["episodes_watched"]
+        stats["total_anime"] += sign
+        if anime["status"] == "Completed":
+            stats["completed_anime"] += sign
+
+        for genre in split_genres(anime["genre"]):
+            self.genre_counter[genre] += sign
+            if self.genre_counter[genre] <= 0:
+                del self.genre_counter[genre]
+        self.finish_stats()
+
+    def list_changed(self, adult_mode=None):
+        """Drop the cached views of one list, or of both when adult_mode is None"""
+        if adult_mode is None:
+            keys = ("anime_list", "adult_content")
+        else:
+            keys = ("adult_content" if adult_mode else "anime_list",)
+        for key in keys:
+            self.display_order_cache.pop(key, None)
+
+    def anime_counts(self) -> Tuple[int, int]:
+        """Number of normal and adult anime, read from the running statistics"""
+        stats = self.data["stats"]
+        adult_total = stats["total_adult_content"]
+        normal_total = stats["total_anime"] - adult_total if stats["includes_adult"] else stats["total_anime"]
+        return normal_total, adult_total
+
+    def finish_stats(self):
+        """Fill in the statistics derived from the running totals"""
+        stats = self.data["stats"]
+        total_hours = stats["total_episodes_watched"] * 24 / 60  # Assuming 24 minutes per episode
+        completion_rate = (stats["completed_anime"] / stats["total_anime"] * 100) if stats["total_anime"] else 0
+
+        stats["total_hours_watched"] = round(total_hours, 1)
+        stats["completion_rate"] = round(completion_rate, 1)
 
     def display_anime_list(self, adult_mode=False):
         anime_list = self.data["adult_content"] if adult_mode else self.data["anime_list"]
@@ -445,7 +773,18 @@ class AnimeTracker:
         if not anime_list:
             console.print(Panel.fit("No anime in your list yet! Add some with 'add' command.", style="yellow"))
             return
-        
+
+        # The sorted order is kept until the list changes
+        key = "adult_content" if adult_mode else "anime_list"
+        sorted_list = self.display_order_cache.get(key)
+        if sorted_list is None:
+            sorted_list = self.display_order_cache[key] = sorted(anime_list, key=last_watched_key, reverse=True)
+        self.render_anime_table(sorted_list, adult_mode)
+
+    def render_anime_table(self, anime_list, adult_mode=False):
+        """Print already sorted anime as the watchlist table"""
+        from rich import box
+        from rich.table import Table
         table = Table(title=f"🎌 {'Adult Content' if adult_mode else 'Anime Watchlist'} 🎌", box=box.ROUNDED)
         table.add_column("ID", justify="center", style="cyan", min_width=3)
         table.add_column("Title", style="magenta", min_width=20)
@@ -455,28 +794,17 @@ class AnimeTracker:
         table.add_column("Rating", justify="center", style="red", min_width=6)
         table.add_column("Last Watched", justify="center", style="blue", min_width=12)
 
-        for anime in sorted(anime_list, key=lambda x:x.get("last_watched", ""), reverse=True):
-            #color coding for status
-            status_colors = {
-                "Watching": "[green]Watching[/green]",
-                "Completed": "[blue]Completed[/blue]",
-                "On Hold": "[yellow]On Hold[/yellow]",
-                "Dropped": "[red]Dropped[/red]",
-                "Plan to Watch": "[white]Plan to Watch[/white]"
-            }
-
-            progress = f"{anime['episodes_watched']}/{anime['total_episodes']}"
-            if anime['episodes_watched'] == anime['total_episodes'] and anime['total_episodes'] > 0:
-                progress = f"[green]{progress}[/green]"
-            elif anime['episodes_watched'] > 0:
-                progress = f"[yellow]{progress}[/yellow]"
+        add_row = table.add_row
+        for anime in anime_list:
+            watched, total = anime["episodes_watched"], anime["total_episodes"]
+            progress = PROGRESS_FORMATS[(watched > 0) + (watched == total and total > 0)].format(watched, total)
 
             rating_display = f"⭐{anime['rating']}" if anime['rating'] > 0 else "Not Rated"
-            table.add_row(
+            add_row(
                 str(anime["id"]),
                 anime["title"],
                 anime["genre"],
-                status_colors.get(anime["status"], anime["status"]),
+                STATUS_MARKUP.get(anime["status"], anime["status"]),
                 progress,
                 rating_display,
                 anime.get("last_watched", "Never") or "Never"
@@ -492,29 +820,34 @@ class AnimeTracker:
         self.display_anime_list(adult_mode)
         try:
             anime_id = int(Prompt.ask("Enter the anime ID to upadate"))
-            anime = next((a for a in anime_list if a["id"]==anime_id), None)
+            anime = self.anime_by_id.get(anime_id)
 
-            if not anime:
+            if not anime or anime["adult_content"] != adult_mode:
                 console.print("[red]Anime not found[/red]")
                 return
             console.print(f"Updating: [magenta]{anime['title']}[/magenta]")
 
             field = Prompt.ask("What to update?", choices=["status", "episodes", "rating", "notes", "all"])
-            if field in ["status", "all"]:
-                anime["status"] = Prompt.ask("Status", choices=["Watching", "Completed", "On Hold", "Dropped", "Plan to Watch"], default=anime["status"])
-            if field in ["episodes", "all"]:
-                anime["episodes_watched"] = int(Prompt.ask("Episodes Watched", default=str(anime["episodes_watched"])))
-                if anime["episodes_watched"] > 0:
-                    anime["last_watched"] = datetime.now().strftime("%Y-%m-%d")
-
-            if field in ["rating", "all"]:
-                anime["rating"] = float(Prompt.ask("Rating (1-10)", default=str(anime["rating"])))
-            
-            if field in ["notes", "all"]:
-                anime["notes"] = Prompt.ask("Notes", default=anime["notes"])
+            # Take the old values out of the running stats and add the new ones back even if an input is invalid
+            self.track_stats(anime, adult_mode, -1)
+            try:
+                if field in ["status", "all"]:
+                    anime["status"] = Prompt.ask("Status", choices=["Watching", "Completed", "On Hold", "Dropped", "Plan to Watch"], default=anime["status"])
+                if field in ["episodes", "all"]:
+                    anime["episodes_watched"] = int(Prompt.ask("Episodes Watched", default=str(anime["episodes_watched"])))
+                    if anime["episodes_watched"] > 0:
+                        anime["last_watched"] = datetime.now().strftime("%Y-%m-%d")
+
+                if field in ["rating", "all"]:
+                    anime["rating"] = float(Prompt.ask("Rating (1-10)", default=str(anime["rating"])))
+                
+                if field in ["notes", "all"]:
+                    anime["notes"] = Prompt.ask("Notes", default=anime["notes"])
+            finally:
+                self.list_changed(adult_mode)
+                self.track_stats(anime, adult_mode)
             
-            self.update_stats()
-            self.save_data()
+            self.mark_dirty()
             console.print("[green]✓ Anime updated successfully![/green]")
         except ValueError:
             console.print("[red]Invalid Input![/red]")
@@ -530,16 +863,18 @@ class AnimeTracker:
 
         try:
             anime_id = int(Prompt.ask("Enter anime ID to delete"))
-            anime = next((a for a in anime_list if a["id"]==anime_id), None)
+            anime = self.anime_by_id.get(anime_id)
 
-            if not anime:
+            if not anime or anime["adult_content"] != adult_mode:
                 console.print("[red]Anime not found[/red]")
                 return
             
             if Confirm.ask(f"Delete '[magenta]{anime['title']}[/magenta]'?"):
                 anime_list.remove(anime)
-                self.update_stats()
-                self.save_data()
+                del self.anime_by_id[anime_id]
+                self.list_changed(adult_mode)
+                self.track_stats(anime, adult_mode, -1)
+                self.mark_dirty()
                 console.print("[green]✓ Anime deleted successfully![/green]")
             
         except ValueError:
@@ -556,6 +891,8 @@ class AnimeTracker:
         self.update_stats(include_adult=include_adult)
         stats = self.data["stats"]
 
+        from rich import box
+        from rich.table import Table
         stats_table = Table(title="📊 Your Anime Statistics 📊", box=box.ROUNDED)
         stats_table.add_column("Metric", style="cyan", min_width=20)
         stats_table.add_column("Value", style="magenta", min_width=15)
@@ -597,39 +934,36 @@ class AnimeTracker:
         if results:
             console.print(f"[green]Found {len(results)} results(s): [/green]")
 
-            #a temp data to view data
-            temp_data = {"anime_list": results, "adult_content": []}
-            original_data = self.data
-            self.data = temp_data
-            self.display_anime_list(False)
-            self.data = original_data
+            self.render_anime_table(sorted(results, key=last_watched_key, reverse=True))
         else:
             console.print("[yellow]No results found![/yellow]")
 
     def export_data(self):
-        exports_dir = os.path.join(self.app_dir, "exports")
-        if not os.path.exists(exports_dir):
-            os.makedirs(exports_dir)
-
-        filename = os.path.join(exports_dir, f"anime_exports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        now = datetime.now()
+        filename = os.path.join(self.exports_dir, f"anime_exports_{now.strftime('%Y%m%d_%H%M%S')}.json")
         #without adult content unless requested
+        include_adult = Confirm.ask("Include adult content in export?") and self.unlock_adult_content()
+        # The stats may still cover a different scope from the last 'stats' command
+        if self.data["stats"]["includes_adult"] != include_adult:
+            self.recompute_stats(include_adult)
+
+        total_anime, total_adult_content = self.anime_counts()
         export_data = {
             "anime_list": self.data["anime_list"],
             "stats": self.data["stats"],
-            "export_date": datetime.now().isoformat(),
+            "export_date": now.isoformat(),
             "export_info": {
-                "total_anime": len(self.data["anime_list"]),
-                "total_adult_content": len(self.data["adult_content"]),
+                "total_anime": total_anime,
+                "total_adult_content": total_adult_content,
                 "app_version": "1.0.0"
             }
         }
-        if Confirm.ask("Include adult content in export?"):
-            if self.verify_adult_password():
-                export_data["adult_content"] = self.data["adult_content"]
+        if include_adult:
+            export_data["adult_content"] = self.data["adult_content"]
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                write_json(f, export_data)
             console.print(f"[green]✓ Data exported to:[/green]")
             console.print(f"[cyan]{filename}[/cyan]")
             
@@ -637,7 +971,7 @@ class AnimeTracker:
             console.print(f"[red]Error exporting data: {e}[/red]")
     
     def import_data(self):
-        exports_dir = os.path.join(self.app_dir, "exports")
+        exports_dir = self.exports_dir
         if not os.path.exists(exports_dir):
             console.print("[yellow]No exports directory found![/yellow]")
             return
@@ -657,8 +991,7 @@ class AnimeTracker:
             if 0 <= choice < len(export_files):
                 filename = os.path.join(exports_dir, export_files[choice])
 
-                with open(filename, 'r', encoding='utf-8') as f:
-                    import_data = json.load(f)
+                import_data = read_json_file(filename)
                 #merge or replace data
                 merge_option = Prompt.ask("Import option", choices=["merge", "replace"], default="merge")
                 
@@ -666,27 +999,33 @@ class AnimeTracker:
                     if Confirm.ask("This will replace all current data. Continue?"):
                         self.data["anime_list"] = import_data.get("anime_list", [])
                         if "adult_content" in import_data:
-                            if self.verify_adult_password():
+                            if self.unlock_adult_content():
                                 self.data["adult_content"] = import_data.get("adult_content", [])
+                        self.index_anime()
                 else:
                     #merge data
-                    current_ids = {anime["id"] for anime in self.data["anime_list"] + self.data["adult_content"]}
-                    next_id = max(current_ids) + 1 if current_ids else 1
+                    next_id = self.next_id
 
                     for anime in import_data.get("anime_list", []):
                         anime["id"] = next_id
+                        anime.setdefault("adult_content", False)
+                        self.anime_by_id[next_id] = anime
                         next_id+=1
                         self.data["anime_list"].append(anime)
                     
                     if "adult_content" in import_data:
-                        if self.verify_adult_password():
+                        if self.unlock_adult_content():
                             for anime in import_data.get("adult_content",[]):
                                 anime["id"] = next_id
+                                anime.setdefault("adult_content", True)
+                                self.anime_by_id[next_id] = anime
                                 next_id += 1
                                 self.data["adult_content"].append(anime)
+                    self.next_id = next_id
                 
-                self.update_stats()
-                self.save_data()
+                self.list_changed()
+                self.recompute_stats(self.data["stats"]["includes_adult"])
+                self.mark_dirty()
                 console.print("[green]✓ Data imported successfully![/green]")
         except (ValueError, IndexError):
             console.print("[red]Invalid selection![/red]")
@@ -694,28 +1033,31 @@ class AnimeTracker:
             console.print(f"[red]Error importing data: {e}[/red]")
 
     def create_backup(self):
-        backup_dir = os.path.join(self.app_dir, "backups")
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = os.path.join(backup_dir, f"backup_{timestamp}.json")
+        now = datetime.now()
+        # One folder per month keeps directories small, microseconds keep quick backups apart
+        backup_dir = os.path.join(self.backups_dir, now.strftime('%Y'), now.strftime('%m'))
+        backup_file = os.path.join(backup_dir, f"backup_{now.strftime('%Y%m%d_%H%M%S_%f')}.json")
+        total_anime, total_adult_content = self.anime_counts()
 
         backup_data = {
             "anime_list": self.data["anime_list"],
             "adult_content": self.data["adult_content"],
             "stats": self.data["stats"],
-            "backup_date": datetime.now().isoformat(),
+            "backup_date": now,
             "backup_info": {
-                "total_anime": len(self.data["anime_list"]),
-                "total_adult_content": len(self.data["adult_content"]),
+                "total_anime": total_anime,
+                "total_adult_content": total_adult_content,
                 "app_version": "1.0.0"
             }
         }
 
         try:
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, ensure_ascii=False)
+            if backup_dir != self.backup_month_dir:
+                os.makedirs(backup_dir, exist_ok=True)
+                self.backup_month_dir = backup_dir
+            # The write buffer gathers the streamed pieces into large writes
+            with open(backup_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                write_json(f, backup_data)
             
             console.print(f"[green]✓ Backup created:[/green]")
             console.print(f"[cyan]{backup_file}[/cyan]")
@@ -724,39 +1066,50 @@ class AnimeTracker:
             console.print(f"[red]Error creating backup: {e}[/red]")
 
     def show_app_info(self):
+        from rich import box
+        from rich.table import Table
         info_table = Table(title="📱 App Information 📱", box=box.ROUNDED)
         info_table.add_column("Property", style="cyan", min_width=20)
         info_table.add_column("Value", style="magenta", min_width=30)
         
-        info_table.add_row("Version", "1.0.0")
-        info_table.add_row("Data Directory", self.app_dir)
-        info_table.add_row("Config File", "config.json")
-        info_table.add_row("Data File", "anime_data.enc")
-        info_table.add_row("Exports Directory", os.path.join(self.app_dir, "exports"))
-        info_table.add_row("Backups Directory", os.path.join(self.app_dir, "backups"))
+        if self.info_rows is None:
+            self.info_rows = (
+                ("Version", "1.0.0"),
+                ("Data Directory", self.app_dir),
+                ("Config File", "config.json"),
+                ("Data File", "anime_data.enc"),
+                ("Exports Directory", self.exports_dir),
+                ("Backups Directory", self.backups_dir)
+            )
+        for row in self.info_rows:
+            info_table.add_row(*row)
         
-        #for file sizes
-        try:
-            if os.path.exists(self.data_file):
-                size = os.path.getsize(self.data_file)
-                info_table.add_row("Data File Size", f"{size:,} bytes")
-        except:
-            pass
+        #for file sizes, known already if the data file was loaded or saved this session
+        size = self.data_file_size
+        if size is None:
+            try:
+                if os.path.exists(self.data_file):
+                    size = os.path.getsize(self.data_file)
+            except:
+                pass
+        if size is not None:
+            info_table.add_row("Data File Size", f"{size:,} bytes")
 
         console.print(info_table)
 
     def display_all_anime(self, adult_mode=False):
-        if adult_mode and not self.verify_adult_password():
+        if adult_mode and not self.unlock_adult_content():
             console.print("The Password is wrong, Try again.")
             return
         
-        all_anime = self.data["anime_list"].copy()
-        if adult_mode:
-            all_anime.extend(self.data["adult_content"])
+        anime_list = self.data["anime_list"]
+        adult_list = self.data["adult_content"] if adult_mode else []
 
-        if not all_anime:
+        if not anime_list and not adult_list:
             console.print(Panel.fit("no anime in your list yet!", style="yellow"))
             return
+        from rich import box
+        from rich.table import Table
         table = Table(title="🎌 Complete Anime List 🎌", box=box.ROUNDED)
         table.add_column("ID", justify="center", style="cyan")
         table.add_column("Title", style="magenta")
@@ -766,37 +1119,37 @@ class AnimeTracker:
         table.add_column("Progress", justify="center", style="yellow")
         table.add_column("Rating", justify="center", style="red")
 
-        for anime in sorted(all_anime, key=lambda x: x["id"]):
-            #type of the anime
-            anime_type = "🔞" if anime.get("adult_content", False) else "👶"
-            status_colors = {
-            "Watching": "[green]Watching[/green]",
-            "Completed": "[blue]Completed[/blue]",
-            "On Hold": "[yellow]On Hold[/yellow]",
-            "Dropped": "[red]Dropped[/red]",
-            "Plan to Watch": "[white]Plan to Watch[/white]"
-        }
-            #progress display
-            progress = f"{anime['episodes_watched']}/{anime['total_episodes']}"
-            if anime['episodes_watched'] == anime['total_episodes']:
-                progress = f"[green]{progress}[/green]"
-            elif anime['episodes_watched'] > 0:
-                progress = f"[yellow]{progress}[/yellow]"
-        
-            table.add_row(
-                str(anime["id"]),
-                anime["title"],
-                anime_type,
-                anime["genre"],
-                status_colors.get(anime["status"], anime["status"]),
-                progress,
-                f"⭐{anime['rating']}" if anime['rating'] > 0 else "Not Rated"
+        anime_types = (Text("👶"), Text("🔞"))
+        not_rated = Text("Not Rated")
+        add_row = table.add_row
+        status_text = STATUS_TEXT.get
+
+        # Each list is already in id order, so the adult list only needs merging in
+        all_anime = heapq.merge(anime_list, adult_list, key=operator.itemgetter("id")) if adult_list else anime_list
+        for anime in all_anime:
+            ew = anime["episodes_watched"]
+            te = anime["total_episodes"]
+            rating = anime["rating"]
+            color = 2 if ew == te else (ew > 0)
+            status = anime["status"]
+
+            add_row(
+                Text(str(anime["id"])),
+                Text(anime["title"]),
+                # index_anime guarantees the adult_content flag on every entry
+                anime_types[anime["adult_content"]],
+                Text(anime["genre"]),
+                status_text(status) or Text(status),
+                Text(f"{ew}/{te}", style=PROGRESS_STYLES[color]),
+                Text(f"⭐{rating}") if rating > 0 else not_rated
             )
     
         console.print(table)
 
     def show_help(self):
-        help_text = f"""
+        # The help text never changes after startup, so build the panel once
+        if self.help_panel is None:
+            help_text = f"""
 [bold cyan]📺 Anime Watchlist Tracker Commands 📺[/bold cyan]
 
 [yellow]Basic Commands:[/yellow]
@@ -828,9 +1181,14 @@ class AnimeTracker:
 [dim]{self.app_dir}[/dim]
 
 [bold red]Note:[/bold red] Adult content requires password verification
-        """
-        console.print(Panel(help_text, title="Help Menu", border_style="blue"))
+            """
+            self.help_panel = Panel(help_text, title="Help Menu", border_style="blue")
+        console.print(self.help_panel)
+
 
+    def enter_adult_mode(self):
+        console.print("[red]🔞 Adult Content Mode Activated[/red]")
+        self.display_anime_list(adult_mode=True)
 
     def main_menu(self):
         self.load_data()
@@ -847,72 +1205,22 @@ class AnimeTracker:
 
         while True:
             try:
-                command = Prompt.ask("\n[bold cyan]AnimeTracker[/bold cyan]").lower().strip()
+                command = Prompt.ask("\n[bold cyan]AnimeTracker[/bold cyan]").strip().lower()
                 if command == "quit" or command == "exit":
+                    self.flush()
                     console.print("[green]Thanks for using Anime Tracker! 👋[/green]")
                     break
-                elif command == "add":
-                    self.add_anime()
-                
-                elif command == "list":
-                    self.display_anime_list()
-                
-                elif command == "update":
-                    self.update_anime()
-                
-                elif command == "delete":
-                    self.delete_anime()
-                
-                elif command == "search":
-                    self.search_anime()
-                
-                elif command == "stats":
-                    self.show_stats()
-                
-                elif command == "export":
-                    self.export_data()
-                
-                elif command == "import":
-                    self.import_data()
-                
-                elif command == "backup":
-                    self.create_backup()
-                
-                elif command == "info":
-                    self.show_app_info()
-                
-                elif command == "help":
-                    self.show_help()
-                
-                # Adult content commands
-                elif command == "adult":
-                    if self.verify_adult_password():
-                        console.print("[red]🔞 Adult Content Mode Activated[/red]")
-                        self.display_anime_list(adult_mode=True)
-                
-                elif command == "adult-add":
-                    if self.verify_adult_password():
-                        self.add_anime(adult_mode=True)
-                
-                elif command == "adult-list":
-                    if self.verify_adult_password():
-                        self.display_anime_list(adult_mode=True)
-                
-                elif command == "adult-update":
-                    if self.verify_adult_password():
-                        self.update_anime(adult_mode=True)
-                
-                elif command == "adult-delete":
-                    if self.verify_adult_password():
-                        self.delete_anime(adult_mode=True)
-                
-                elif command == "adult-search":
-                    if self.verify_adult_password():
-                        self.search_anime(adult_mode=True)
 
-                elif command == "list-all":
-                    self.display_all_anime(adult_mode=True)
-                    
+                # Adult content commands need the adult password first (or a recent unlock)
+                adult_handler = self.adult_commands.get(command)
+                if adult_handler:
+                    if self.unlock_adult_content():
+                        adult_handler()
+                    continue
+
+                handler = self.commands.get(command)
+                if handler:
+                    handler()
                 else:
                     console.print("[red]Unknown command. Type 'help' for available commands.[/red]")
             except KeyboardInterrupt:
@@ -922,11 +1230,19 @@ class AnimeTracker:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Anime Watchlist Tracker")
+    parser.add_argument("--reauth", action="store_true",
+                        help="ignore the cached key and ask for the master password")
+    args = parser.parse_args()
+
     try:
-        tracker = AnimeTracker()
+        tracker = AnimeTracker(reauth=args.reauth)
         tracker.main_menu()
     except KeyboardInterrupt:
         console.print("\n[green]Goodbye! 👋[/green]")
+    except ImportError as e:
+        console.print(f"[red]Missing required package '{e.name}'. {MISSING_PACKAGES_HINT}[/red]")
+        sys.exit(1)
     except Exception as e:
         console.print(f"[red]Fatal error: {e}[/red]")
         sys.exit(1)
\ No newline at end of file